@@ -1,19 +1,142 @@
 import os
+import asyncio
 import logging
-from flask import Flask, render_template, request, jsonify, flash, redirect, url_for
+from concurrent.futures import as_completed
+
+import orjson
+from flask import Flask, render_template, stream_template, stream_with_context, request, jsonify, flash, redirect, url_for
+from flask.json.provider import JSONProvider
+
 from services.parallel_search import ParallelSearchService
 from services.openai_service import OpenAIService
+from services.background_jobs import JobStore
+from services.event_loop import run_coroutine, submit_coroutine
 
 # Configure logging for debugging
 logging.basicConfig(level=logging.DEBUG)
 
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson, several times faster than stdlib json"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 # Create the Flask app
 app = Flask(__name__)
 app.secret_key = os.environ.get("SESSION_SECRET", "medical-search-secret-key")
+app.json = OrjsonProvider(app)
 
 # Initialize services
 parallel_search = ParallelSearchService()
 openai_service = OpenAIService()
+job_store = JobStore()
+
+# How results are ranked for LLM enhancement: high-evidence sources first,
+# everything else by relevance. Only the top results get GPT-5 treatment;
+# the rest keep the on-demand Enhanced Summary button.
+SOURCE_PRIORITY = {
+    'Cochrane': 5,
+    'NEJM': 5,
+    'JAMA': 5,
+    'The Lancet': 5,
+    'BMJ': 4,
+    'PubMed': 4,
+    'Nature': 4,
+    'Science': 4,
+    'UpToDate': 4,
+    'WHO': 3,
+    'CDC': 3,
+    'NIH': 3,
+    'Mayo Clinic': 3
+}
+ENHANCED_RESULT_LIMIT = 5
+
+def _rank_results(search_results):
+    """Order results by source priority, then relevance score"""
+    return sorted(
+        search_results,
+        key=lambda r: (SOURCE_PRIORITY.get(r.get('source_type'), 1), r.get('relevance_score', 0)),
+        reverse=True
+    )
+
+def _content_preview(content):
+    """Truncate content for display, computed once per result"""
+    return content[:500] + '...' if len(content) > 500 else content
+
+async def _enhance_result(result, query):
+    """Enhance a single search result with an AI summary and credibility score"""
+    preview = _content_preview(result['content'])
+    try:
+        # Summary and credibility come back from a single OpenAI call
+        analysis = await openai_service.aanalyze_result(result, query)
+        return {
+            'title': result['title'],
+            'url': result['url'],
+            'content': preview,
+            'summary': analysis['summary'],
+            'credibility_score': analysis['credibility_score'],
+            'source_type': result.get('source_type', 'Medical Literature'),
+            'publication_date': result.get('publication_date', 'Unknown')
+        }
+    except Exception as e:
+        app.logger.error(f"Error processing result: {str(e)}")
+        # Include result even if enhancement fails
+        return {
+            'title': result['title'],
+            'url': result['url'],
+            'content': preview,
+            'summary': 'Summary unavailable',
+            'credibility_score': 'Unknown',
+            'source_type': result.get('source_type', 'Medical Literature'),
+            'publication_date': result.get('publication_date', 'Unknown')
+        }
+
+def _enhance_results(search_results, query):
+    """Enhance all search results concurrently instead of one at a time"""
+    async def gather_all():
+        return await asyncio.gather(
+            *(_enhance_result(result, query) for result in search_results)
+        )
+    return run_coroutine(gather_all())
+
+def _iter_enhanced_results(search_results, query):
+    """Yield enhanced results one by one as their OpenAI calls complete
+
+    Drives all enhancements concurrently on the shared event loop but
+    hands each result back as soon as it is ready, so a streamed template
+    can render the first card after one LLM round-trip instead of waiting
+    for the whole batch.
+    """
+    futures = [submit_coroutine(_enhance_result(result, query)) for result in search_results]
+    for future in as_completed(futures):
+        yield future.result()
+
+def _basic_result(result):
+    """Build a result entry without LLM enhancement; summary stays on-demand"""
+    return {
+        'title': result['title'],
+        'url': result['url'],
+        'content': _content_preview(result['content']),
+        'summary': '',
+        'credibility_score': 'Unknown',
+        'source_type': result.get('source_type', 'Medical Literature'),
+        'publication_date': result.get('publication_date', 'Unknown')
+    }
+
+def _iter_ranked_results(search_results, query):
+    """Yield top-priority results with LLM enhancement, the rest without
+
+    Spending GPT-5 tokens on every result doubles cost for sources the
+    user will rank last anyway; low-priority results render immediately
+    with a lazy Enhanced Summary hook instead.
+    """
+    ranked = _rank_results(search_results)
+    yield from _iter_enhanced_results(ranked[:ENHANCED_RESULT_LIMIT], query)
+    for result in ranked[ENHANCED_RESULT_LIMIT:]:
+        yield _basic_result(result)
 
 @app.route('/')
 def index():
@@ -50,41 +173,14 @@ def search():
             flash('No medical literature found for your query. Please try different terms.', 'info')
             return redirect(url_for('index'))
         
-        # Process results with OpenAI for better medical context
-        enhanced_results = []
-        for result in search_results:
-            try:
-                # Generate medical summary and extract key points
-                summary = openai_service.generate_medical_summary(result['content'], query)
-                credibility_score = openai_service.assess_medical_credibility(result)
-                
-                enhanced_result = {
-                    'title': result['title'],
-                    'url': result['url'],
-                    'content': result['content'][:500] + '...' if len(result['content']) > 500 else result['content'],
-                    'summary': summary,
-                    'credibility_score': credibility_score,
-                    'source_type': result.get('source_type', 'Medical Literature'),
-                    'publication_date': result.get('publication_date', 'Unknown')
-                }
-                enhanced_results.append(enhanced_result)
-            except Exception as e:
-                app.logger.error(f"Error processing result: {str(e)}")
-                # Include result even if enhancement fails
-                enhanced_results.append({
-                    'title': result['title'],
-                    'url': result['url'],
-                    'content': result['content'][:500] + '...' if len(result['content']) > 500 else result['content'],
-                    'summary': 'Summary unavailable',
-                    'credibility_score': 'Unknown',
-                    'source_type': result.get('source_type', 'Medical Literature'),
-                    'publication_date': result.get('publication_date', 'Unknown')
-                })
-        
-        return render_template('search_results.html', 
-                             query=query, 
-                             results=enhanced_results, 
-                             total_results=len(enhanced_results))
+        # Stream the page, rendering each result card as its OpenAI
+        # enhancement finishes instead of blocking on the whole batch
+        return app.response_class(stream_with_context(
+            stream_template('search_results.html',
+                            query=query,
+                            results=_iter_ranked_results(search_results, query),
+                            total_results=len(search_results))
+        ))
         
     except Exception as e:
         app.logger.error(f"Search error: {str(e)}")
@@ -104,24 +200,18 @@ def api_search():
         # Perform search
         search_results = parallel_search.search_medical_literature(query)
         
-        # Process with OpenAI
-        enhanced_results = []
-        for result in search_results[:5]:  # Limit to top 5 for API
-            try:
-                summary = openai_service.generate_medical_summary(result['content'], query)
-                credibility_score = openai_service.assess_medical_credibility(result)
-                
-                enhanced_results.append({
-                    'title': result['title'],
-                    'url': result['url'],
-                    'summary': summary,
-                    'credibility_score': credibility_score,
-                    'source_type': result.get('source_type', 'Medical Literature')
-                })
-            except Exception as e:
-                app.logger.error(f"Error processing API result: {str(e)}")
-                continue
-        
+        # Process with OpenAI, limiting to top 5 for API
+        enhanced_results = [
+            {
+                'title': r['title'],
+                'url': r['url'],
+                'summary': r['summary'],
+                'credibility_score': r['credibility_score'],
+                'source_type': r['source_type']
+            }
+            for r in _enhance_results(_rank_results(search_results)[:5], query)
+        ]
+
         return jsonify({
             'query': query,
             'results': enhanced_results,
@@ -132,6 +222,49 @@ def api_search():
         app.logger.error(f"API search error: {str(e)}")
         return jsonify({'error': 'Search service temporarily unavailable'}), 500
 
+@app.route('/api/search_async', methods=['POST'])
+def api_search_async():
+    """API endpoint that returns bare results immediately with a job id
+
+    LLM enhancement runs in the background; clients poll /results/<job_id>
+    for enriched rows as they finish, so time-to-first-byte stays at
+    search latency instead of search plus the whole enhancement batch.
+    """
+    try:
+        data = request.get_json()
+        query = data.get('query', '').strip()
+
+        if not query:
+            return jsonify({'error': 'Query parameter is required'}), 400
+
+        search_results = parallel_search.search_medical_literature(query)
+        ranked = _rank_results(search_results)
+        to_enhance = ranked[:ENHANCED_RESULT_LIMIT]
+
+        job_id = job_store.submit(
+            lambda: _iter_enhanced_results(to_enhance, query),
+            total=len(to_enhance)
+        )
+
+        return jsonify({
+            'query': query,
+            'job_id': job_id,
+            'results': [_basic_result(r) for r in ranked],
+            'total_results': len(ranked)
+        })
+
+    except Exception as e:
+        app.logger.error(f"Async API search error: {str(e)}")
+        return jsonify({'error': 'Search service temporarily unavailable'}), 500
+
+@app.route('/results/<job_id>')
+def job_results(job_id):
+    """Poll endpoint for background enhancement jobs"""
+    job = job_store.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown or expired job id'}), 404
+    return jsonify(job)
+
 @app.route('/summarize', methods=['POST'])
 def summarize():
     """API endpoint for content summarization"""
@@ -154,6 +287,29 @@ def summarize():
         app.logger.error(f"Summarization error: {str(e)}")
         return jsonify({'error': 'Summarization service temporarily unavailable'}), 500
 
+@app.route('/stream_summary', methods=['POST'])
+def stream_summary():
+    """Stream a summary as Server-Sent Events so tokens render as they arrive"""
+    try:
+        data = request.get_json()
+        content = data.get('content', '')
+        context = data.get('context', '')
+
+        if not content:
+            return jsonify({'error': 'Content parameter is required'}), 400
+
+        def generate():
+            for chunk in openai_service.stream_medical_summary(content, context):
+                # JSON-encode each chunk so newlines survive SSE framing
+                yield f"data: {orjson.dumps(chunk).decode()}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return app.response_class(stream_with_context(generate()), mimetype='text/event-stream')
+
+    except Exception as e:
+        app.logger.error(f"Summary streaming error: {str(e)}")
+        return jsonify({'error': 'Summarization service temporarily unavailable'}), 500
+
 @app.errorhandler(404)
 def not_found(error):
     """Handle 404 errors"""
@@ -167,4 +323,5 @@ def internal_error(error):
     return render_template('index.html'), 500
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    # Development server only - production runs under gunicorn (see .replit)
+    app.run(host='0.0.0.0', port=5000, debug=True, threaded=True)
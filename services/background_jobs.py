@@ -0,0 +1,72 @@
+import uuid
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+class JobStore:
+    """In-process store for background result-enhancement jobs
+
+    Stands in for an external queue (RQ/Celery): work runs on a small
+    thread pool and results accumulate incrementally, so clients can poll
+    for enriched rows as they finish instead of blocking on the whole
+    batch. State is per-process and lost on restart, which is acceptable
+    for enhancement work that can simply be re-requested.
+    """
+
+    def __init__(self, max_workers: int = 4, max_jobs: int = 256):
+        self.max_jobs = max_jobs
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, result_iter_factory, total: int) -> str:
+        """
+        Start a background job and return its id
+
+        Args:
+            result_iter_factory: Zero-argument callable returning an iterable
+                of result dicts; results are stored as they are yielded
+            total: Expected number of results, reported to pollers
+
+        Returns:
+            Job id for polling via get()
+        """
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._jobs[job_id] = {'status': 'running', 'total': total, 'results': []}
+            # Drop the oldest jobs so abandoned pollers can't grow memory
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+        self._executor.submit(self._run, job_id, result_iter_factory)
+        return job_id
+
+    def _run(self, job_id: str, result_iter_factory):
+        """Drive the job's iterator, appending each result as it arrives"""
+        status = 'finished'
+        try:
+            for result in result_iter_factory():
+                with self._lock:
+                    job = self._jobs.get(job_id)
+                    if job is None:  # evicted while running
+                        return
+                    job['results'].append(result)
+        except Exception as e:
+            logging.error(f"Background job {job_id} failed: {str(e)}")
+            status = 'failed'
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job['status'] = status
+
+    def get(self, job_id: str):
+        """Return a snapshot of the job's status and results, or None"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            return {
+                'status': job['status'],
+                'total': job['total'],
+                'results': list(job['results'])
+            }
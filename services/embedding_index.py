@@ -0,0 +1,111 @@
+import sqlite3
+import logging
+import threading
+
+import numpy as np
+
+# Dimension of text-embedding-3-small vectors
+EMBEDDING_DIM = 1536
+
+class EmbeddingIndex:
+    """Nearest-neighbor index over query embeddings, persisted to SQLite
+
+    Backs the semantic layer of the summary cache: near-duplicate queries
+    (e.g. "diabetes type 2 treatment" vs "T2DM management") hit the same
+    stored summary when their embeddings are close enough. Entries are
+    scoped to a namespace (the content hash) so a similar query only
+    reuses a summary of the same article. Vectors are loaded from SQLite
+    at startup, so every process starts warm from past sessions.
+
+    Vectors are stored scalar-quantized to int8 (unit-norm components
+    scaled by 127), cutting resident and on-disk size 4x versus float32
+    with negligible recall loss at the similarity thresholds used here.
+    """
+
+    def __init__(self, db_path: str = "embeddings.db", dim: int = EMBEDDING_DIM):
+        self.dim = dim
+        self._vectors = np.empty((0, dim), dtype=np.int8)
+        self._namespaces = []
+        self._values = []
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (namespace TEXT NOT NULL, vector BLOB NOT NULL, value TEXT NOT NULL)"
+        )
+        self._conn.commit()
+        self._load()
+
+    def _load(self):
+        """Load all persisted vectors into the in-memory matrix"""
+        try:
+            rows = self._conn.execute("SELECT namespace, vector, value FROM embeddings").fetchall()
+        except sqlite3.Error as e:
+            logging.error(f"Failed to load embedding index: {str(e)}")
+            return
+        if not rows:
+            return
+        vectors = []
+        for _, vector, _ in rows:
+            if len(vector) == self.dim * 4:
+                # Entry persisted before quantization - convert on load
+                vectors.append(self._quantize(np.frombuffer(vector, dtype=np.float32)))
+            else:
+                vectors.append(np.frombuffer(vector, dtype=np.int8))
+        self._vectors = np.vstack(vectors)
+        self._namespaces = [namespace for namespace, _, _ in rows]
+        self._values = [value for _, _, value in rows]
+        logging.info(f"Loaded {len(rows)} embeddings from index")
+
+    def _normalize(self, vector) -> np.ndarray:
+        """L2-normalize so the inner product equals cosine similarity"""
+        arr = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(arr)
+        return arr / norm if norm else arr
+
+    @staticmethod
+    def _quantize(normalized: np.ndarray) -> np.ndarray:
+        """Scalar-quantize a unit vector's components to int8"""
+        return np.clip(np.rint(normalized * 127.0), -127, 127).astype(np.int8)
+
+    def search(self, vector, namespace: str, threshold: float = 0.92):
+        """
+        Return the stored value for the most similar vector in namespace
+
+        Args:
+            vector: Query embedding
+            namespace: Scope to search within (content hash)
+            threshold: Minimum cosine similarity to count as a hit
+
+        Returns:
+            The cached value, or None if nothing is similar enough
+        """
+        with self._lock:
+            if not self._values:
+                return None
+            # int8 rows dequantize back to ~unit vectors via the 1/127 scale
+            similarities = (self._vectors @ self._normalize(vector)) / 127.0
+            best = None
+            for i in np.argsort(similarities)[::-1]:
+                if similarities[i] < threshold:
+                    break
+                if self._namespaces[i] == namespace:
+                    best = self._values[i]
+                    break
+            return best
+
+    def add(self, vector, namespace: str, value: str):
+        """Add an embedding and its value to the index and SQLite"""
+        quantized = self._quantize(self._normalize(vector))
+        with self._lock:
+            self._vectors = np.vstack([self._vectors, quantized[np.newaxis, :]])
+            self._namespaces.append(namespace)
+            self._values.append(value)
+            try:
+                self._conn.execute(
+                    "INSERT INTO embeddings (namespace, vector, value) VALUES (?, ?, ?)",
+                    (namespace, quantized.tobytes(), value)
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logging.error(f"Failed to persist embedding: {str(e)}")
@@ -0,0 +1,30 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+
+# Async resources (httpx connection pools, asyncio locks) are bound to
+# the event loop that created them. Running each request on a throwaway
+# asyncio.run loop left keep-alive connections pointing at closed loops,
+# failing the next request within the keep-alive window. All async work
+# is therefore driven on this single background loop thread, so
+# loop-affine state lives on exactly one loop for the process lifetime.
+_loop = asyncio.new_event_loop()
+
+def _run_forever():
+    asyncio.set_event_loop(_loop)
+    _loop.run_forever()
+
+_thread = threading.Thread(target=_run_forever, name="shared-event-loop", daemon=True)
+_thread.start()
+
+def run_coroutine(coro):
+    """Run a coroutine on the shared loop and block until it completes"""
+    return asyncio.run_coroutine_threadsafe(coro, _loop).result()
+
+def submit_coroutine(coro) -> Future:
+    """Schedule a coroutine on the shared loop without waiting
+
+    Returns:
+        concurrent.futures.Future resolving to the coroutine's result
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _loop)
@@ -1,11 +1,58 @@
 import os
-import requests
+import re
+import random
+import asyncio
 import logging
 from typing import List, Dict, Any
 
+import httpx
+import orjson
+
+from services.event_loop import run_coroutine
+
+# Known medical publishers and the source labels shown in results
+MEDICAL_DOMAINS = {
+    'pubmed.ncbi.nlm.nih.gov': 'PubMed',
+    'nejm.org': 'NEJM',
+    'jamanetwork.com': 'JAMA',
+    'thelancet.com': 'The Lancet',
+    'bmj.com': 'BMJ',
+    'nature.com': 'Nature',
+    'science.org': 'Science',
+    'cochranelibrary.com': 'Cochrane',
+    'uptodate.com': 'UpToDate',
+    'who.int': 'WHO',
+    'cdc.gov': 'CDC',
+    'nih.gov': 'NIH',
+    'mayoclinic.org': 'Mayo Clinic'
+}
+
+# Compiled once so each URL is classified in a single C-level scan instead
+# of one Python-level substring check per domain
+_DOMAIN_RE = re.compile('|'.join(re.escape(domain) for domain in MEDICAL_DOMAINS))
+
+# Retry policy for transient search API failures
+MAX_RETRIES = 3
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+
+# Shared across all requests so every query multiplexes over one pooled
+# HTTP/2 connection instead of paying a ~150-300ms TCP+TLS handshake per
+# query. Driven exclusively on the shared event loop (services.event_loop)
+# so pooled connections never outlive the loop that created them. The
+# transport retries transient connection failures before they surface as
+# search errors.
+_client = httpx.AsyncClient(
+    timeout=10,
+    transport=httpx.AsyncHTTPTransport(
+        http2=True,
+        retries=3,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=16)
+    )
+)
+
 class ParallelSearchService:
     """Service for interacting with parallel.ai Search API for medical literature"""
-    
+
     def __init__(self):
         self.api_key = os.environ.get("PARALLEL_API_KEY", "")
         self.base_url = "https://api.parallel.ai/v1beta/search"
@@ -18,108 +65,153 @@ class ParallelSearchService:
             logging.warning("PARALLEL_API_KEY environment variable not set")
     
     def search_medical_literature(self, query: str, max_results: int = 10) -> List[Dict[str, Any]]:
+        """Synchronous wrapper around asearch_medical_literature
+
+        Runs the search on the shared event loop, which is safe to call
+        from any thread - including threads that run their own loop.
+        """
+        return run_coroutine(self.asearch_medical_literature(query, max_results))
+
+    async def _post_with_retry(self, payload: Dict[str, Any]) -> httpx.Response:
+        """
+        POST one search payload, retrying transient failures with backoff
+
+        A single 429 or 502 previously killed the whole search. Retries
+        429/5xx responses and timeouts with jittered exponential backoff,
+        honoring a numeric Retry-After header when the API sends one.
+        Connection-level failures are already retried by the transport.
+        """
+        for attempt in range(MAX_RETRIES):
+            try:
+                response = await _client.post(self.base_url, headers=self.headers, json=payload)
+            except httpx.TimeoutException:
+                delay = min(0.5 * (2 ** attempt), 8.0) * random.uniform(1.0, 1.5)
+                logging.warning(f"Parallel.ai request timed out, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+
+            if response.status_code not in RETRY_STATUS_CODES:
+                return response
+
+            try:
+                delay = float(response.headers.get('Retry-After', ''))
+            except ValueError:
+                delay = min(0.5 * (2 ** attempt), 8.0)
+            delay *= random.uniform(1.0, 1.5)
+            logging.warning(f"Parallel.ai returned {response.status_code}, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+        # Last attempt: whatever happens here surfaces to the caller
+        return await _client.post(self.base_url, headers=self.headers, json=payload)
+
+    async def asearch_medical_literature(self, query: str, max_results: int = 10) -> List[Dict[str, Any]]:
         """
         Search for medical literature using parallel.ai Search API
-        
+
+        All query variants are sent concurrently and their results merged,
+        deduplicated by URL.
+
         Args:
             query: Medical search query
-            max_results: Maximum number of results to return
-            
+            max_results: Maximum number of results to return per query variant
+
         Returns:
             List of search results with medical content
         """
         try:
             if not self.api_key:
                 raise Exception("Parallel.ai API key not configured")
-            
-            # Simplified search queries for better results
+
+            # Query variants fired in parallel for broader coverage
             search_queries = [
                 f"{query}",
                 f"{query} medical",
                 f"{query} clinical"
             ]
-            
-            payload = {
+
+            base_payload = {
                 "objective": f"Find medical information about: {query}",
-                "search_queries": search_queries[:2],  # Use top 2 queries
                 "processor": "base",
                 "max_results": max_results,
                 "max_chars_per_result": 1500
             }
-            
+
             logging.info(f"Searching parallel.ai for medical query: {query}")
-            response = requests.post(self.base_url, headers=self.headers, json=payload, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                logging.debug(f"Parallel.ai response: {data}")
-                results = []
-                
-                # Process search results
-                search_results = data.get('results', [])
-                for result in search_results:
-                    # Extract content from excerpts array (new API format)
-                    excerpts = result.get('excerpts', [])
-                    content = ' '.join(excerpts) if excerpts else result.get('content', '')
-                    
-                    processed_result = {
-                        'title': result.get('title', 'Medical Literature'),
-                        'url': result.get('url', ''),
-                        'content': content,
-                        'source_type': self._determine_source_type(result.get('url', '')),
-                        'publication_date': result.get('date', 'Unknown'),
-                        'relevance_score': result.get('score', 0)
-                    }
-                    
-                    # Only include results with substantial content
-                    if len(processed_result['content'].strip()) > 50:  # Lower threshold for excerpts
-                        results.append(processed_result)
-                
-                logging.info(f"Found {len(results)} medical literature results")
-                return results
-            
-            elif response.status_code == 401:
-                raise Exception("Invalid Parallel.ai API key")
-            elif response.status_code == 429:
-                raise Exception("Parallel.ai API rate limit exceeded")
-            else:
-                logging.error(f"Parallel.ai API error: {response.status_code} - {response.text}")
-                raise Exception(f"Search service error: {response.status_code}")
-                
-        except requests.exceptions.Timeout:
-            logging.error("Parallel.ai API timeout")
-            raise Exception("Search request timed out. Please try again with a simpler query.")
-        except requests.exceptions.RequestException as e:
-            logging.error(f"Parallel.ai request error: {str(e)}")
-            raise Exception("Unable to connect to search service. Please try again.")
+            responses = await asyncio.gather(*(
+                self._post_with_retry({**base_payload, "search_queries": [search_query]})
+                for search_query in search_queries
+            ), return_exceptions=True)
+
+            results = []
+            seen_urls = set()
+            last_error = None
+
+            for response in responses:
+                if isinstance(response, httpx.TimeoutException):
+                    logging.error("Parallel.ai API timeout")
+                    last_error = Exception("Search request timed out. Please try again with a simpler query.")
+                    continue
+                if isinstance(response, httpx.HTTPError):
+                    logging.error(f"Parallel.ai request error: {str(response)}")
+                    last_error = Exception("Unable to connect to search service. Please try again.")
+                    continue
+                if isinstance(response, BaseException):
+                    raise response
+
+                if response.status_code == 200:
+                    # orjson parses the large results payload faster than
+                    # the stdlib parser behind response.json()
+                    data = orjson.loads(response.content)
+                    logging.debug(f"Parallel.ai response: {data}")
+
+                    for result in data.get('results', []):
+                        url = result.get('url', '')
+                        # Query variants often return the same article - keep the first hit
+                        if url and url in seen_urls:
+                            continue
+
+                        # Extract content from excerpts array (new API format)
+                        excerpts = result.get('excerpts', [])
+                        content = ' '.join(excerpts) if excerpts else result.get('content', '')
+
+                        processed_result = {
+                            'title': result.get('title', 'Medical Literature'),
+                            'url': url,
+                            'content': content,
+                            'source_type': self._determine_source_type(url),
+                            'publication_date': result.get('date', 'Unknown'),
+                            'relevance_score': result.get('score', 0)
+                        }
+
+                        # Only include results with substantial content
+                        if len(processed_result['content'].strip()) > 50:  # Lower threshold for excerpts
+                            results.append(processed_result)
+                            if url:
+                                seen_urls.add(url)
+
+                elif response.status_code == 401:
+                    raise Exception("Invalid Parallel.ai API key")
+                elif response.status_code == 429:
+                    last_error = Exception("Parallel.ai API rate limit exceeded")
+                else:
+                    logging.error(f"Parallel.ai API error: {response.status_code} - {response.text}")
+                    last_error = Exception(f"Search service error: {response.status_code}")
+
+            # Surface an error only if every query variant failed
+            if not results and last_error:
+                raise last_error
+
+            logging.info(f"Found {len(results)} medical literature results")
+            return results
+
         except Exception as e:
             logging.error(f"Search error: {str(e)}")
             raise Exception(f"Search failed: {str(e)}")
     
     def _determine_source_type(self, url: str) -> str:
         """Determine the type of medical source based on URL"""
-        medical_domains = {
-            'pubmed.ncbi.nlm.nih.gov': 'PubMed',
-            'nejm.org': 'NEJM',
-            'jamanetwork.com': 'JAMA',
-            'thelancet.com': 'The Lancet',
-            'bmj.com': 'BMJ',
-            'nature.com': 'Nature',
-            'science.org': 'Science',
-            'cochranelibrary.com': 'Cochrane',
-            'uptodate.com': 'UpToDate',
-            'who.int': 'WHO',
-            'cdc.gov': 'CDC',
-            'nih.gov': 'NIH',
-            'mayoclinic.org': 'Mayo Clinic'
-        }
-        
-        url_lower = url.lower()
-        for domain, source_name in medical_domains.items():
-            if domain in url_lower:
-                return source_name
-        
-        return 'Medical Literature'
+        match = _DOMAIN_RE.search(url.lower())
+        return MEDICAL_DOMAINS[match.group(0)] if match else 'Medical Literature'
     
     def search_specific_medical_topic(self, topic: str, specialty: str = "") -> List[Dict[str, Any]]:
         """
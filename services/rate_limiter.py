@@ -0,0 +1,56 @@
+import os
+import time
+import asyncio
+import logging
+
+class RateLimiter:
+    """Client-side token bucket throttling OpenAI requests and tokens per minute
+
+    Keeps concurrent traffic at the account's rate ceiling instead of
+    bursting into 429 responses and serializing under server-side backoff.
+    Caps are configurable via the OPENAI_RPM and OPENAI_TPM environment
+    variables.
+    """
+
+    def __init__(self, requests_per_minute: float = 0, tokens_per_minute: float = 0):
+        self.requests_per_minute = requests_per_minute or float(os.environ.get("OPENAI_RPM", "500"))
+        self.tokens_per_minute = tokens_per_minute or float(os.environ.get("OPENAI_TPM", "200000"))
+        self.available_requests = self.requests_per_minute
+        self.available_tokens = self.tokens_per_minute
+        self.last_update = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        """Refill both buckets based on time elapsed since the last update"""
+        now = time.monotonic()
+        elapsed = now - self.last_update
+        self.last_update = now
+        self.available_requests = min(
+            self.requests_per_minute,
+            self.available_requests + elapsed * self.requests_per_minute / 60.0
+        )
+        self.available_tokens = min(
+            self.tokens_per_minute,
+            self.available_tokens + elapsed * self.tokens_per_minute / 60.0
+        )
+
+    async def acquire(self, estimated_tokens: int = 0):
+        """
+        Wait until capacity for one request and estimated_tokens is available
+
+        Args:
+            estimated_tokens: Expected prompt plus completion tokens for the call
+        """
+        while True:
+            async with self._lock:
+                self._refill()
+                if self.available_requests >= 1 and self.available_tokens >= estimated_tokens:
+                    self.available_requests -= 1
+                    self.available_tokens -= estimated_tokens
+                    return
+                wait_time = max(
+                    (1 - self.available_requests) * 60.0 / self.requests_per_minute,
+                    (estimated_tokens - self.available_tokens) * 60.0 / self.tokens_per_minute
+                )
+            logging.debug(f"Rate limit reached, waiting {wait_time:.2f}s before next OpenAI call")
+            await asyncio.sleep(wait_time)
@@ -0,0 +1,42 @@
+import hashlib
+from collections import OrderedDict
+
+class SummaryCache:
+    """In-memory LRU cache for generated summaries and credibility scores
+
+    The same articles come back across related searches, and GPT-5 calls
+    dominate /search latency and cost, so repeat (content, query) pairs
+    are served from cache without touching the model. Credibility is
+    query-agnostic, so those entries are keyed on the source URL alone.
+    """
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def summary_key(content: str, query_context: str = "") -> str:
+        """Cache key for a summary of content in the context of a query"""
+        # Only the first 3000 chars are sent to the model, so hashing more
+        # would split identical prompts into distinct entries
+        digest = hashlib.blake2b(content[:3000].encode() + b'|' + query_context.encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def credibility_key(url: str) -> str:
+        """Cache key for a credibility assessment of a source URL"""
+        return hashlib.blake2b(b'credibility|' + url.encode()).hexdigest()
+
+    def get(self, key: str):
+        """Return the cached value for key, or None on a miss"""
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str):
+        """Store a value, evicting the least recently used entry when full"""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)